@@ -1,43 +1,244 @@
 import azure.functions as func
 import azure.durable_functions as df
-from azure.data.tables import TableServiceClient
-from azure.storage.blob import BlobServiceClient
+from azure.data.tables.aio import TableServiceClient
+from azure.storage.blob.aio import BlobServiceClient
 from PIL import Image
+import numpy as np
+import orjson
 
+import asyncio
+import collections
 import logging
-import json
 import io
+import math
 import os
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 app = df.DFApp(http_auth_level=func.AuthLevel.ANONYMOUS)
 
 TABLE_NAME = "ImageAnalysisResults"
 PARTITION_KEY = "ImageAnalysis"
+# RowKeys are (MAX_EPOCH_MS - analyzed-at ms) so the table's natural order is newest first.
+# The prefix sorts below every hex digit, so these keys also list ahead of older plain-UUID RowKeys.
+RESULT_ID_PREFIX = "!"
+MAX_EPOCH_MS = 9_999_999_999_999
+# Table transactions accept at most 100 entities from a single partition
+TABLE_BATCH_SIZE = 100
+# Largest $top a table query accepts
+TABLE_MAX_PAGE_SIZE = 1000
+
+# Blobs are streamed in chunks of this size; during the pixel decode only about one chunk is held
+BLOB_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+# Shared across invocations; never closed (no `async with`) so the connection pools stay warm
+_BLOB_SVC = None
+_TABLE_CLIENT = None
+_TABLE_LOCK = asyncio.Lock()
+
+
+def get_blob_service():
+    global _BLOB_SVC
+    if _BLOB_SVC is None:
+        conn_str = os.environ["ImageStorageConnection"]
+        # The SDK's own aiohttp session keeps up to 100 connections alive; downloads beyond
+        # that wait for a free connection rather than opening and discarding new ones
+        _BLOB_SVC = BlobServiceClient.from_connection_string(
+            conn_str,
+            connection_timeout=5,
+            read_timeout=30,
+            max_single_get_size=BLOB_CHUNK_SIZE,
+            max_chunk_get_size=BLOB_CHUNK_SIZE,
+        )
+    return _BLOB_SVC
 
 
-def get_table_client():
-    connection_string = os.environ["ImageStorageConnection"]
-    table_service = TableServiceClient.from_connection_string(connection_string)
-    table_service.create_table_if_not_exists(TABLE_NAME)
-    return table_service.get_table_client(TABLE_NAME)
+async def get_table_client():
+    global _TABLE_CLIENT
+    if _TABLE_CLIENT is None:
+        async with _TABLE_LOCK:
+            if _TABLE_CLIENT is None:
+                connection_string = os.environ["ImageStorageConnection"]
+                table_service = TableServiceClient.from_connection_string(connection_string)
+                await table_service.create_table_if_not_exists(TABLE_NAME)
+                _TABLE_CLIENT = table_service.get_table_client(TABLE_NAME)
+    return _TABLE_CLIENT
 
 
-def download_blob_bytes(blob_name: str) -> bytes:
+def get_blob_client(blob_name: str):
     """
     blob_name looks like: 'images/file.jpg'
     """
-    conn_str = os.environ["ImageStorageConnection"]
-    service = BlobServiceClient.from_connection_string(conn_str)
-
     if "/" in blob_name:
         container, blob = blob_name.split("/", 1)
     else:
         container, blob = "images", blob_name
 
-    blob_client = service.get_blob_client(container=container, blob=blob)
-    return blob_client.download_blob().readall()
+    return get_blob_service().get_blob_client(container=container, blob=blob)
+
+
+def iter_chunks_threadsafe(downloader, loop):
+    """
+    Yields the chunks of an async blob download from a worker thread by
+    scheduling each fetch on the event loop that owns the client.
+    """
+    chunks = downloader.chunks()
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(chunks.__anext__(), loop).result()
+        except StopAsyncIteration:
+            return
+
+
+class BlobStream(io.RawIOBase):
+    """
+    Read-only file object over an iterator of blob chunks, pulled on demand.
+    Everything read stays buffered so PIL can seek back while sniffing the header;
+    once release_consumed() is called, chunks the reader has moved past are dropped.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffered = collections.deque()
+        self._base = 0
+        self._end = 0
+        self._pos = 0
+        self._exhausted = False
+        self._release = False
+
+    def _fill(self, end: int):
+        while not self._exhausted and (end < 0 or self._end < end):
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._exhausted = True
+                break
+            self._buffered.append(chunk)
+            self._end += len(chunk)
+
+    def release_consumed(self):
+        """
+        Switches to sequential reading for the pixel decode. The decoder may still
+        seek back to where it currently is, but not before data it has read past.
+        """
+        self._release = True
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            self._fill(-1)
+            offset += self._end
+        offset = max(0, offset)
+        if offset < self._base:
+            raise io.UnsupportedOperation("cannot seek back into released blob data")
+        self._pos = offset
+        return self._pos
+
+    def readinto(self, b):
+        size = len(b)
+        self._fill(self._pos + size)
+
+        written = 0
+        start = self._base
+        for chunk in self._buffered:
+            if written == size:
+                break
+            cursor = self._pos + written
+            if cursor < start + len(chunk):
+                lo = cursor - start
+                n = min(len(chunk) - lo, size - written)
+                b[written:written + n] = memoryview(chunk)[lo:lo + n]
+                written += n
+            start += len(chunk)
+        self._pos += written
+
+        if self._release:
+            while self._buffered and self._base + len(self._buffered[0]) <= self._pos:
+                self._base += len(self._buffered.popleft())
+
+        return written
+
+
+class EntityBatcher:
+    """
+    Group-commits upserts from concurrent invocations into table transactions.
+    A background task flushes the queue in batches of TABLE_BATCH_SIZE; each
+    caller only waits until its own entity is written.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._drainer = None
+
+    async def upsert(self, entity: dict):
+        done = asyncio.get_running_loop().create_future()
+        self._pending.append((entity, done))
+
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+
+        await done
+
+    async def _drain(self):
+        batch = []
+        try:
+            while self._pending:
+                batch = self._pending[:TABLE_BATCH_SIZE]
+                del self._pending[:TABLE_BATCH_SIZE]
+
+                try:
+                    table_client = await get_table_client()
+                except Exception as e:
+                    for _, done in batch:
+                        if not done.done():
+                            done.set_exception(e)
+                    batch = []
+                    continue
+
+                if len(batch) > 1:
+                    try:
+                        await table_client.submit_transaction([("upsert", entity) for entity, _ in batch])
+                    except Exception:
+                        # Transactions are all-or-nothing; retry one by one so a bad row only fails its own caller
+                        logging.warning("Batched upsert of %d entities failed, retrying individually", len(batch), exc_info=True)
+                    else:
+                        for _, done in batch:
+                            if not done.done():
+                                done.set_result(None)
+                        batch = []
+                        continue
+
+                for entity, done in batch:
+                    try:
+                        await table_client.upsert_entity(entity)
+                    except Exception as e:
+                        if not done.done():
+                            done.set_exception(e)
+                    else:
+                        if not done.done():
+                            done.set_result(None)
+                batch = []
+        finally:
+            # Only reached with work left if the drain itself was cancelled (e.g. host shutdown)
+            unresolved = batch + self._pending
+            self._pending = []
+            for _, done in unresolved:
+                if not done.done():
+                    done.set_exception(RuntimeError("Result writer stopped before the entity was stored"))
+
+
+_RESULT_WRITER = EntityBatcher()
 
 
 # 1) Blob trigger (client)
@@ -57,72 +258,125 @@ async def blob_trigger(myblob: func.InputStream, client):
     logging.info(f"Started orchestration {instance_id} for {blob_name}")
 
 
-# 2) Orchestrator (fan-out / fan-in + chaining)
+# 2) Orchestrator (chaining)
 @app.orchestration_trigger(context_name="context")
 def image_analyzer_orchestrator(context):
     input_data = context.get_input()
 
-    analysis_tasks = [
-        context.call_activity("analyze_colors", input_data),
-        context.call_activity("analyze_objects", input_data),
-        context.call_activity("analyze_text", input_data),
-        context.call_activity("analyze_metadata", input_data),
-    ]
-
-    results = yield context.task_all(analysis_tasks)
-
-    report_input = {
-        "blob_name": input_data["blob_name"],
-        "colors": results[0],
-        "objects": results[1],
-        "text": results[2],
-        "metadata": results[3],
-    }
+    analyses = yield context.call_activity("analyze_image", input_data)
 
-    report = yield context.call_activity("generate_report", report_input)
-    record = yield context.call_activity("store_results", report)
+    store_input = {"blob_name": input_data["blob_name"], "analyses": analyses}
+
+    record = yield context.call_activity("store_results", store_input)
     return record
 
 
-# 3) Analyze colors (real)
+# 3) Analyze image: download and decode once, then run every analysis on it
 @app.activity_trigger(input_name="inputData")
-def analyze_colors(inputData: dict):
-    logging.info("Analyzing colors...")
+async def analyze_image(inputData: dict):
+    logging.info("Analyzing image...")
 
     try:
-        image_bytes = download_blob_bytes(inputData["blob_name"])
-        image = Image.open(io.BytesIO(image_bytes))
+        # False is already the SDK default; pinned so the analysis path never picks up per-chunk MD5 checks
+        downloader = await get_blob_client(inputData["blob_name"]).download_blob(validate_content=False)
+    except Exception as e:
+        logging.exception("Image download failed")
+        return failed_analyses(e)
+
+    # PIL reads synchronously, so decode on a worker thread and fetch chunks back on this loop
+    stream = BlobStream(iter_chunks_threadsafe(downloader, asyncio.get_running_loop()))
+    return await asyncio.to_thread(run_analyses, stream, inputData.get("blob_size_kb"))
 
-        if image.mode != "RGB":
-            image = image.convert("RGB")
 
-        small_image = image.resize((50, 50))
-        pixels = list(small_image.getdata())
+def run_analyses(stream: BlobStream, blob_size_kb) -> dict:
+    try:
+        image = Image.open(stream)
+    except Exception as e:
+        logging.exception("Image load failed")
+        return failed_analyses(e)
 
-        color_counts = {}
-        for r, g, b in pixels:
-            key = (r // 32 * 32, g // 32 * 32, b // 32 * 32)
-            color_counts[key] = color_counts.get(key, 0) + 1
+    # These decoders read the file front to back (JPEG rewinds to 0 first, PNG seeks
+    # to the first IDAT), so chunks they have read past can be freed during load()
+    if image.format in ("JPEG", "PNG"):
+        stream.release_consumed()
 
-        sorted_colors = sorted(color_counts.items(), key=lambda x: x[1], reverse=True)
+    # Header-only analyses run first: analyze_colors decodes at a reduced scale
+    metadata = analyze_metadata(image, blob_size_kb)
+    objects = analyze_objects(metadata)
+    text = analyze_text(image)
+    colors = analyze_colors(image)
 
-        top_colors = []
-        for (r, g, b), count in sorted_colors[:5]:
-            top_colors.append({
-                "hex": f"#{r:02x}{g:02x}{b:02x}",
-                "rgb": {"r": r, "g": g, "b": b},
-                "percentage": round(count / len(pixels) * 100, 1),
-            })
+    return {"colors": colors, "objects": objects, "text": text, "metadata": metadata}
 
-        grayscale_pixels = sum(
-            1 for r, g, b in pixels if abs(r - g) < 30 and abs(g - b) < 30
-        )
-        is_grayscale = grayscale_pixels / len(pixels) > 0.9
+
+def failed_analyses(e: Exception) -> dict:
+    return {
+        "colors": {"dominantColors": [], "isGrayscale": False, "totalPixelsSampled": 0, "error": str(e)},
+        "objects": {"objects": [], "objectCount": 0, "error": str(e)},
+        "text": analyze_text(None),
+        "metadata": {"width": 0, "height": 0, "format": "Unknown", "error": str(e)},
+    }
+
+
+# Color analysis (real)
+def analyze_colors(image: Image.Image) -> dict:
+    logging.info("Analyzing colors...")
+
+    try:
+        # Let libjpeg decode at a reduced scale; no-op for other formats
+        image.draft("RGB", (200, 200))
+
+        # Averaging L and then expanding to RGB gives the same pixels as the reverse, so L is
+        # converted after reducing. RGBA/LA are converted first: reduce() premultiplies alpha,
+        # which would drop the colour of transparent pixels that the RGB conversion keeps.
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        # Integer box-average down to about 50x50 worth of pixels; aspect ratio is kept
+        width, height = image.size
+        factor = max(1, math.ceil(math.sqrt(width * height / 2500)))
+        # Shrink the short side first (never below one pixel), then pick the long side's
+        # factor from what is left so the sample stays within about 2500 pixels
+        if width <= height:
+            factor_x = min(factor, width)
+            factor_y = max(1, math.ceil(height * math.ceil(width / factor_x) / 2500))
+        else:
+            factor_y = min(factor, height)
+            factor_x = max(1, math.ceil(width * math.ceil(height / factor_y) / 2500))
+        small_image = image.reduce((factor_x, factor_y))
+        if small_image.mode != "RGB":
+            small_image = small_image.convert("RGB")
+        pixels = np.asarray(small_image, dtype=np.uint8).reshape(-1, 3)
+        total_pixels = len(pixels)
+
+        # Bucket each channel into 8 bins of 32 and pack the three 3-bit indices into 0..511
+        bins = (pixels >> 5).astype(np.uint16)
+        keys = (bins[:, 0] << 6) | (bins[:, 1] << 3) | bins[:, 2]
+        counts = np.bincount(keys, minlength=512)
+        # Only the top 5 buckets are reported, so partition instead of sorting them all
+        top = np.argpartition(-counts, 4)[:5]
+        top = top[np.argsort(-counts[top], kind="stable")]
+        top = top[counts[top] > 0]
+
+        # Unpack the winning buckets back into channels in one shot; Python only touches 5 rows
+        rgbs = np.stack([(top >> 6) << 5, ((top >> 3) & 7) << 5, (top & 7) << 5], axis=1)
+        percentages = np.round(counts[top] / total_pixels * 100, 1)
+
+        top_colors = [{
+            "hex": f"#{r:02x}{g:02x}{b:02x}",
+            "rgb": {"r": r, "g": g, "b": b},
+            "percentage": percentage,
+        } for (r, g, b), percentage in zip(rgbs.tolist(), percentages.tolist())]
+
+        # |r - g| and |g - b| for every sampled pixel in one pass
+        channel_diffs = np.abs(np.diff(pixels.astype(np.int16), axis=1))
+        gray_mask = (channel_diffs < 30).all(axis=1)
+        is_grayscale = bool(gray_mask.mean() > 0.9)
 
         return {
             "dominantColors": top_colors,
             "isGrayscale": is_grayscale,
-            "totalPixelsSampled": len(pixels),
+            "totalPixelsSampled": total_pixels,
         }
 
     except Exception as e:
@@ -130,15 +384,15 @@ def analyze_colors(inputData: dict):
         return {"dominantColors": [], "isGrayscale": False, "totalPixelsSampled": 0, "error": str(e)}
 
 
-# 4) Analyze objects (mock)
-@app.activity_trigger(input_name="inputData")
-def analyze_objects(inputData: dict):
+# Object detection (mock)
+def analyze_objects(metadata: dict) -> dict:
     logging.info("Analyzing objects...")
 
     try:
-        image_bytes = download_blob_bytes(inputData["blob_name"])
-        image = Image.open(io.BytesIO(image_bytes))
-        width, height = image.size
+        # The mock only looks at dimensions, which the metadata analysis already read
+        if "error" in metadata:
+            raise ValueError(metadata["error"])
+        width, height = metadata["width"], metadata["height"]
 
         mock_objects = []
         if width > height:
@@ -160,22 +414,17 @@ def analyze_objects(inputData: dict):
         return {"objects": [], "objectCount": 0, "error": str(e)}
 
 
-# 5) Analyze text (mock)
-@app.activity_trigger(input_name="inputData")
-def analyze_text(inputData: dict):
+# Text detection (mock)
+def analyze_text(image: Image.Image) -> dict:
     logging.info("Analyzing text (OCR)...")
     return {"hasText": False, "extractedText": "", "confidence": 0.0, "language": "unknown", "note": "Mock OCR"}
 
 
-# 6) Analyze metadata (real)
-@app.activity_trigger(input_name="inputData")
-def analyze_metadata(inputData: dict):
+# Metadata analysis (real)
+def analyze_metadata(image: Image.Image, blob_size_kb) -> dict:
     logging.info("Analyzing metadata...")
 
     try:
-        image_bytes = download_blob_bytes(inputData["blob_name"])
-        image = Image.open(io.BytesIO(image_bytes))
-
         width, height = image.size
         total_pixels = width * height
 
@@ -186,7 +435,7 @@ def analyze_metadata(inputData: dict):
             "mode": image.mode,
             "totalPixels": total_pixels,
             "megapixels": round(total_pixels / 1_000_000, 2),
-            "sizeKB": inputData.get("blob_size_kb"),
+            "sizeKB": blob_size_kb,
         }
 
     except Exception as e:
@@ -194,45 +443,46 @@ def analyze_metadata(inputData: dict):
         return {"width": 0, "height": 0, "format": "Unknown", "error": str(e)}
 
 
-# 7) Generate report
-@app.activity_trigger(input_name="reportData")
-def generate_report(reportData: dict):
+# 4) Generate report (runs inside store_results; ids and timestamps stay out of the orchestrator)
+def generate_report(blob_name: str, analyses: dict) -> dict:
     logging.info("Generating combined report...")
 
-    blob_name = reportData["blob_name"]
     filename = blob_name.split("/")[-1] if "/" in blob_name else blob_name
 
+    analyzed_at = datetime.now(timezone.utc)
+    epoch_ms = int(analyzed_at.timestamp() * 1000)
+
     report = {
-        "id": str(uuid.uuid4()),
+        "id": f"{RESULT_ID_PREFIX}{MAX_EPOCH_MS - epoch_ms:013d}-{uuid.uuid4().hex}",
         "fileName": filename,
         "blobPath": blob_name,
-        "analyzedAt": datetime.utcnow().isoformat(),
+        "analyzedAt": analyzed_at.isoformat(timespec="seconds"),
         "analyses": {
-            "colors": reportData["colors"],
-            "objects": reportData["objects"],
-            "text": reportData["text"],
-            "metadata": reportData["metadata"],
+            "colors": analyses["colors"],
+            "objects": analyses["objects"],
+            "text": analyses["text"],
+            "metadata": analyses["metadata"],
         },
         "summary": {
-            "imageSize": f"{reportData['metadata'].get('width', 0)}x{reportData['metadata'].get('height', 0)}",
-            "format": reportData["metadata"].get("format", "Unknown"),
-            "dominantColor": reportData["colors"]["dominantColors"][0]["hex"]
-            if reportData["colors"].get("dominantColors") else "N/A",
-            "objectsDetected": reportData["objects"].get("objectCount", 0),
-            "hasText": reportData["text"].get("hasText", False),
-            "isGrayscale": reportData["colors"].get("isGrayscale", False),
+            "imageSize": f"{analyses['metadata'].get('width', 0)}x{analyses['metadata'].get('height', 0)}",
+            "format": analyses["metadata"].get("format", "Unknown"),
+            "dominantColor": analyses["colors"]["dominantColors"][0]["hex"]
+            if analyses["colors"].get("dominantColors") else "N/A",
+            "objectsDetected": analyses["objects"].get("objectCount", 0),
+            "hasText": analyses["text"].get("hasText", False),
+            "isGrayscale": analyses["colors"].get("isGrayscale", False),
         }
     }
 
     return report
 
 
-# 8) Store results
-@app.activity_trigger(input_name="report")
-def store_results(report: dict):
-    logging.info(f"Storing results for {report['fileName']}...")
+# 5) Store results
+@app.activity_trigger(input_name="storeData")
+async def store_results(storeData: dict):
+    report = generate_report(storeData["blob_name"], storeData["analyses"])
 
-    table_client = get_table_client()
+    logging.info(f"Storing results for {report['fileName']}...")
 
     entity = {
         "PartitionKey": PARTITION_KEY,
@@ -240,64 +490,78 @@ def store_results(report: dict):
         "FileName": report["fileName"],
         "BlobPath": report["blobPath"],
         "AnalyzedAt": report["analyzedAt"],
-        "Summary": json.dumps(report["summary"]),
-        "ColorAnalysis": json.dumps(report["analyses"]["colors"]),
-        "ObjectAnalysis": json.dumps(report["analyses"]["objects"]),
-        "TextAnalysis": json.dumps(report["analyses"]["text"]),
-        "MetadataAnalysis": json.dumps(report["analyses"]["metadata"]),
+        "Summary": orjson.dumps(report["summary"]).decode(),
+        "ColorAnalysis": orjson.dumps(report["analyses"]["colors"]).decode(),
+        "ObjectAnalysis": orjson.dumps(report["analyses"]["objects"]).decode(),
+        "TextAnalysis": orjson.dumps(report["analyses"]["text"]).decode(),
+        "MetadataAnalysis": orjson.dumps(report["analyses"]["metadata"]).decode(),
     }
 
-    table_client.upsert_entity(entity)
+    await _RESULT_WRITER.upsert(entity)
 
     logging.info(f"Results stored with ID: {report['id']}")
     return {"id": report["id"], "fileName": report["fileName"], "status": "stored", "analyzedAt": report["analyzedAt"]}
 
 
-# 9) HTTP get results
+# 6) HTTP get results
 @app.route(route="results/{id?}")
-def get_results(req: func.HttpRequest) -> func.HttpResponse:
+async def get_results(req: func.HttpRequest) -> func.HttpResponse:
     logging.info("Get results endpoint called")
 
     try:
-        table_client = get_table_client()
+        table_client = await get_table_client()
         result_id = req.route_params.get("id")
 
         if result_id:
-            entity = table_client.get_entity(PARTITION_KEY, result_id)
+            entity = await table_client.get_entity(PARTITION_KEY, result_id)
             result = {
                 "id": entity["RowKey"],
                 "fileName": entity["FileName"],
                 "blobPath": entity["BlobPath"],
                 "analyzedAt": entity["AnalyzedAt"],
-                "summary": json.loads(entity["Summary"]),
+                "summary": orjson.loads(entity["Summary"]),
                 "analyses": {
-                    "colors": json.loads(entity["ColorAnalysis"]),
-                    "objects": json.loads(entity["ObjectAnalysis"]),
-                    "text": json.loads(entity["TextAnalysis"]),
-                    "metadata": json.loads(entity["MetadataAnalysis"]),
+                    "colors": orjson.loads(entity["ColorAnalysis"]),
+                    "objects": orjson.loads(entity["ObjectAnalysis"]),
+                    "text": orjson.loads(entity["TextAnalysis"]),
+                    "metadata": orjson.loads(entity["MetadataAnalysis"]),
                 },
             }
-            return func.HttpResponse(json.dumps(result, indent=2), mimetype="application/json", status_code=200)
+            return func.HttpResponse(orjson.dumps(result), mimetype="application/json", status_code=200)
 
         limit = int(req.params.get("limit", "10"))
-        entities = list(table_client.query_entities(f"PartitionKey eq '{PARTITION_KEY}'"))
-
-        results = [{
-            "id": e["RowKey"],
-            "fileName": e["FileName"],
-            "analyzedAt": e["AnalyzedAt"],
-            "summary": json.loads(e["Summary"]),
-        } for e in entities]
+        if limit <= 0:
+            return func.HttpResponse(
+                orjson.dumps({"count": 0, "results": []}),
+                mimetype="application/json",
+                status_code=200,
+            )
+
+        entities = table_client.query_entities(
+            f"PartitionKey eq '{PARTITION_KEY}'",
+            select=["RowKey", "FileName", "AnalyzedAt", "Summary"],
+            results_per_page=min(limit, TABLE_MAX_PAGE_SIZE),
+        )
 
-        results.sort(key=lambda x: x["analyzedAt"], reverse=True)
-        results = results[:limit]
+        # RowKeys sort newest first, so the first page already holds the latest results
+        results = []
+        async for e in entities:
+            results.append({
+                "id": e["RowKey"],
+                "fileName": e["FileName"],
+                "analyzedAt": e["AnalyzedAt"],
+                "summary": orjson.loads(e["Summary"]),
+            })
+            # Stop before the pager asks the server for another page
+            if len(results) == limit:
+                break
 
         return func.HttpResponse(
-            json.dumps({"count": len(results), "results": results}, indent=2),
+            orjson.dumps({"count": len(results), "results": results}),
             mimetype="application/json",
             status_code=200,
         )
 
     except Exception as e:
         logging.exception("Failed to retrieve results")
-        return func.HttpResponse(json.dumps({"error": str(e)}), mimetype="application/json", status_code=500)
+        return func.HttpResponse(orjson.dumps({"error": str(e)}), mimetype="application/json", status_code=500)